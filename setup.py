@@ -1,7 +1,7 @@
+from pathlib import Path
 import setuptools
 
-with open("README.md", "r") as fh:
-    long_description = fh.read()
+long_description = Path(__file__).with_name("README.md").read_text(encoding="utf-8")
 
 setuptools.setup(
     name="umbra",
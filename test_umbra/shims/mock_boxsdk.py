@@ -8,6 +8,7 @@ Mock-up of the boxsdk package for testing.
 
 from unittest.mock import (Mock, create_autospec, DEFAULT)
 import tempfile
+import shutil
 from pathlib import Path
 from requests.exceptions import ConnectionError as RequestsConnectionError
 import boxsdk
@@ -45,13 +46,9 @@ class BoxShim:
 
     def upload(self, path, name, **__):
         """Mock upload effect (dump file in /tmp location)."""
-        with open(path, "rb") as f_in:
-            data = f_in.read()
-        path = Path(self.dir.name, name)
-        with open(path, "wb") as f_out:
-            f_out.write(data)
-            f_out.flush()
-        self.uploads.append(path)
+        path_out = Path(self.dir.name, name)
+        shutil.copyfile(path, path_out)
+        self.uploads.append(path_out)
         return DEFAULT
 
     def shared_link_url(self, *_, **__):
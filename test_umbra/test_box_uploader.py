@@ -126,8 +126,19 @@ class TestBoxUploader(TestBoxUploaderBase):
 class TestBoxUploaderMock(TestBoxUploaderBase):
     """Test the BoxUploader class using a mock connection."""
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # The module swap and fake credentials don't change between tests,
+        # so they're set up once per class.  (The mock objects themselves are
+        # still reset after every test.)
+        cls.setup_box_shim()
+        cls.addClassCleanup(cls.teardown_box_shim)
+
     def setup_box(self):
-        self.setup_box_shim()
+        box_path = self.box_config.get("credentials_path")
+        if not box_path or not Path(box_path).exists():
+            self.box_config["credentials_path"] = self.fakecreds.name
         box = BoxUploader(
             self.box_config.get("credentials_path"),
             self.box_config)
@@ -136,37 +147,36 @@ class TestBoxUploaderMock(TestBoxUploaderBase):
     def tearDown(self):
         for item in self.box.list():
             item.unlink()
-        self.teardown_box_shim()
+        # Rebuild the BoxShim object to cleanup temp files and reset the mock
+        # objects
+        mock_boxsdk.BOXSHIM = mock_boxsdk.BoxShim()
 
     # Based on:
     # https://stackoverflow.com/a/1950214/4499968
     # But, see the patching mechanism in unittest.mock.  That may be the right
     # way to go.
-    def setup_box_shim(self):
+    @classmethod
+    def setup_box_shim(cls):
         """Setup testing shim module for the Box SDK."""
         sys.modules["real_boxsdk"] = sys.modules["umbra"].box_uploader.boxsdk
         sys.modules["umbra"].box_uploader.boxsdk = mock_boxsdk
-        box_path = self.box_config.get("credentials_path")
-        if not box_path or not Path(box_path).exists():
-            box_path = NamedTemporaryFile().name
-            self.box_config["credentials_path"] = box_path
-            fakecreds = {
-                "client_id": "A",
-                "client_secret": "B",
-                "redirect_uri": "https://example.com"}
-            fakecreds = ["%s: %s\n" % (k, fakecreds[k]) for k in fakecreds]
-            with open(box_path, "w") as f_out:
-                f_out.writelines(fakecreds)
-
-    @staticmethod
-    def teardown_box_shim():
+        # Fake credentials, for when real ones aren't configured
+        cls.fakecreds = NamedTemporaryFile("w")
+        fakecreds = {
+            "client_id": "A",
+            "client_secret": "B",
+            "redirect_uri": "https://example.com"}
+        fakecreds = ["%s: %s\n" % (k, fakecreds[k]) for k in fakecreds]
+        cls.fakecreds.writelines(fakecreds)
+        cls.fakecreds.flush()
+
+    @classmethod
+    def teardown_box_shim(cls):
         """Swap testing shim module for the real Box SDK."""
         # Tests seem to run fine either way but I don't like the idea that it
         # leaves the fake module masking the real one.
         sys.modules["umbra"].box_uploader.boxsdk = sys.modules["real_boxsdk"]
-        # Rebuild the BoxShim object to cleanup temp files and reset the mock
-        # objects
-        mock_boxsdk.BOXSHIM = mock_boxsdk.BoxShim()
+        cls.fakecreds.close()
 
     def test_upload(self):
         """Test uploading a file to Box."""
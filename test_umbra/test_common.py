@@ -6,8 +6,8 @@ import datetime
 import time
 import unittest
 import logging
+import shutil
 from tempfile import TemporaryDirectory
-from distutils.dir_util import copy_tree
 from pathlib import Path
 import hashlib
 import sys
@@ -19,6 +19,11 @@ PATH_CONFIG = PATH_ROOT / ".." / "test_config.yml"
 
 CONFIG = util.yaml_load(PATH_CONFIG)
 
+# Parent directory for temporary test files, or None for the system default.
+# Pointing this at a RAM-backed filesystem like /dev/shm keeps all the fixture
+# copying off of the disk.
+TMPDIR = CONFIG.get("tmpdir")
+
 TESTLOGGER = logging.getLogger(__name__)
 TESTLOGGER.propagate = False
 TESTLOGGER.setLevel(logging.DEBUG)
@@ -100,8 +105,8 @@ class TestBaseHeavy(TestBase):
 
     def set_up_tmpdir(self):
         """Make a full copy of the demo testdata to a temporary location."""
-        self.tmpdir = TemporaryDirectory()
-        copy_tree(str(PATH_DATA / "demo"), self.tmpdir.name)
+        self.tmpdir = TemporaryDirectory(dir=TMPDIR)
+        shutil.copytree(PATH_DATA / "demo", self.tmpdir.name, dirs_exist_ok=True)
         self.paths = {
             "top":  Path(self.tmpdir.name),
             "runs": Path(self.tmpdir.name) / "runs",
@@ -8,6 +8,8 @@ coordinates simultaneous processing between multiple projects.
 """
 
 import unittest
+import os
+import shutil
 import copy
 import io
 import re
@@ -15,9 +17,6 @@ import warnings
 import threading
 import logging
 from pathlib import Path
-from distutils.dir_util import copy_tree, remove_tree, mkpath
-from distutils.file_util import copy_file
-from tempfile import TemporaryDirectory
 import umbra.processor
 from umbra.processor import IlluminaProcessor
 from umbra.project import ProjectData
@@ -70,6 +69,17 @@ class TestIlluminaProcessor(TestBaseHeavy):
         # Temporary path to use for a report
         self.report_path = Path(self.tmpdir.name) / "report.csv"
 
+    def _stash_dir(self):
+        """Make a directory in the tmpdir for setting files aside."""
+        stash = Path(self.tmpdir.name) / "stash"
+        stash.mkdir(exist_ok=True)
+        return stash
+
+    def _get_run(self, run_id):
+        """Get the loaded Run with the given directory name."""
+        return next(
+            run for run in self.proc.seqinfo["runs"] if run.path.name == run_id)
+
     def _proj_names(self, category):
         return sorted([p.name for p in self.proc.seqinfo["projects"][category]])
 
@@ -83,7 +93,7 @@ class TestIlluminaProcessor(TestBaseHeavy):
         # This is different from refresh() because it will fully load in the
         # current data.  If a run directory is gone, for example, it won't be
         # in the list anymore.
-        remove_tree(str(self.path_run), verbose=True)
+        shutil.rmtree(self.path_run)
         self.proc.load(wait=True)
         self.assertEqual(
             len(self.proc.seqinfo["runs"]),
@@ -94,35 +104,34 @@ class TestIlluminaProcessor(TestBaseHeavy):
         # Note, not running load manually but it should be handled
         # automatically
         # Start with one run missing, stashed elsewhere
-        with TemporaryDirectory() as stash:
-            run_stash = str(Path(stash)/self.expected["run_id"])
-            copy_tree(str(self.path_run), run_stash)
-            remove_tree(self.path_run)
-            # Start with an empty set
-            self.assertEqual(self.proc.seqinfo["runs"], set())
-            proj_exp = {"active": set(), "inactive": set(), "completed": set()}
-            self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
-            # Refresh loads a number of Runs
-            self.proc.refresh()
-            self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"] - 1)
-            self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
-            # Still just those Runs
-            self.proc.refresh()
-            self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"] - 1)
-            self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
-            # Copy run directory back
-            copy_tree(run_stash, str(self.path_run))
-            # Now, we should load a new Run with refresh()
-            self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
-            self.proc.start()
-            self.proc.refresh(wait=True)
-            # Nothing remains to be processed.
-            self.assertEqual(len(self.proc.seqinfo["projects"]["active"]), 0)
-            # STR was already complete.
-            self.assertEqual(self._proj_names("inactive"), ["STR"])
-            # We should have one new completed projectdata now.
-            self.assertEqual(self._proj_names("completed"), ["Something Else"])
-            self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"])
+        stash = self._stash_dir()
+        run_stash = stash/self.expected["run_id"]
+        os.rename(self.path_run, run_stash)
+        # Start with an empty set
+        self.assertEqual(self.proc.seqinfo["runs"], set())
+        proj_exp = {"active": set(), "inactive": set(), "completed": set()}
+        self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
+        # Refresh loads a number of Runs
+        self.proc.refresh()
+        self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"] - 1)
+        self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
+        # Still just those Runs
+        self.proc.refresh()
+        self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"] - 1)
+        self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
+        # Move run directory back
+        os.rename(run_stash, self.path_run)
+        # Now, we should load a new Run with refresh()
+        self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
+        self.proc.start()
+        self.proc.refresh(wait=True)
+        # Nothing remains to be processed.
+        self.assertEqual(len(self.proc.seqinfo["projects"]["active"]), 0)
+        # STR was already complete.
+        self.assertEqual(self._proj_names("inactive"), ["STR"])
+        # We should have one new completed projectdata now.
+        self.assertEqual(self._proj_names("completed"), ["Something Else"])
+        self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"])
 
     def _load_maybe_warning(self):
         if self.expected["warn_msg"]:
@@ -209,59 +218,62 @@ class TestIlluminaProcessor(TestBaseHeavy):
             raise unittest.SkipTest("No run data expected; skipping test")
         run_id = "180102_M00000_0000_000000000-XXXXX"
         path_run = self.paths["runs"]/run_id
-        get_run = lambda: [r for r in self.proc.seqinfo["runs"] if r.path.name == run_id][0]
-        get_al = lambda: get_run().alignments
-        with TemporaryDirectory() as stash:
-            align_orig = str(path_run/"Data"/"Intensities"/"BaseCalls"/"Alignment")
-            align_stash = str(Path(stash)/"Alignment")
-            copy_tree(align_orig, align_stash)
-            remove_tree(align_orig)
-            # Refresh loads all Runs to start with.
-            #with self.assertWarns(Warning) as cm:
-            #    self.proc.refresh()
-            self.proc.refresh(wait=True)
-            self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"])
-            # Third run has no alignments yet
-            self.assertEqual(len(get_al()), 0)
-            # Create empty Alignment directory, as if it's just starting off
-            # and hasn't received any data yet
-            mkpath(align_orig)
-            with self.assertWarns(Warning) as _:
-                self.proc.refresh()
-            # Third run still has no alignments since the sample sheet isn't
-            # there yet, and that's a defining feature for an Alignment,
-            # complete or no.
-            self.assertEqual(len(get_al()), 0)
-            # OK, now there's a sample sheet so the alignment should load.
-            copy_file(Path(align_stash)/"SampleSheetUsed.csv", align_orig)
-            self.proc.refresh(wait=True)
-            # Now there's an incomplete alignment, right?
-            self.assertEqual(len(get_al()), 1)
-            self.assertTrue(not get_al()[0].complete)
-            # Once Checkpoint.txt shows up, the alignment is presumed complete.
-            copy_file(Path(align_stash)/"Checkpoint.txt", align_orig)
-            self.proc.refresh(wait=True)
-            self.assertEqual(len(get_al()), 1)
-            self.assertTrue(get_al()[0].complete)
+        get_al = lambda: self._get_run(run_id).alignments
+        stash = self._stash_dir()
+        align_orig = str(path_run/"Data"/"Intensities"/"BaseCalls"/"Alignment")
+        align_stash = stash/"Alignment"
+        os.rename(align_orig, align_stash)
+        # Refresh loads all Runs to start with.
+        #with self.assertWarns(Warning) as cm:
+        #    self.proc.refresh()
+        self.proc.refresh(wait=True)
+        self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"])
+        # Third run has no alignments yet
+        self.assertEqual(len(get_al()), 0)
+        # Create empty Alignment directory, as if it's just starting off
+        # and hasn't received any data yet
+        os.makedirs(align_orig, exist_ok=True)
+        with self.assertWarns(Warning) as _:
+            self.proc.refresh()
+        # Third run still has no alignments since the sample sheet isn't
+        # there yet, and that's a defining feature for an Alignment,
+        # complete or no.
+        self.assertEqual(len(get_al()), 0)
+        # OK, now there's a sample sheet so the alignment should load.
+        os.link(align_stash/"SampleSheetUsed.csv", Path(align_orig)/"SampleSheetUsed.csv")
+        self.proc.refresh(wait=True)
+        # Now there's an incomplete alignment, right?
+        self.assertEqual(len(get_al()), 1)
+        self.assertTrue(not get_al()[0].complete)
+        # Once Checkpoint.txt shows up, the alignment is presumed complete.
+        os.link(align_stash/"Checkpoint.txt", Path(align_orig)/"Checkpoint.txt")
+        self.proc.refresh(wait=True)
+        self.assertEqual(len(get_al()), 1)
+        self.assertTrue(get_al()[0].complete)
 
 
 class TestIlluminaProcessorDuplicateRun(TestIlluminaProcessor):
     """Test case for a second run directory for an existing Run."""
 
+    WARN_MSG = (
+        "Run directory does not match Run ID: "
+        "run-files-custom-name / "
+        "180102_M00000_0000_000000000-XXXXX")
+
     def set_up_processor(self):
         # including one run that's a duplicate, but it should not become active
         # when the project data is loaded.
         run_orig = str(self.paths["runs"]/"180102_M00000_0000_000000000-XXXXX")
         run_dup = str(self.paths["runs"]/"run-files-custom-name")
-        copy_tree(run_orig, run_dup)
+        # The run data is only ever read, so the duplicate can share the
+        # original's files.
+        shutil.copytree(run_orig, run_dup, copy_function=os.link)
         self.proc = IlluminaProcessor(self.paths["top"], self.config)
 
     def set_up_vars(self):
         super().set_up_vars()
         self.expected["num_runs"] = 6
-        self.expected["warn_msg"] = "Run directory does not match Run ID: "
-        self.expected["warn_msg"] += "run-files-custom-name / "
-        self.expected["warn_msg"] += "180102_M00000_0000_000000000-XXXXX"
+        self.expected["warn_msg"] = self.WARN_MSG
         # There's an extra line in the report due to the duplicated run
         self.expected["report_md5"] = "6b46db0dfae622297dc03544a8a262a4"
 
@@ -323,32 +335,31 @@ class TestIlluminaProcessorReadonly(TestIlluminaProcessor):
 
         ProjectData objects are readonly since the processor is readonly, and
         they get marked inactive."""
-        with TemporaryDirectory() as stash:
-            run_stash = str(Path(stash)/self.expected["run_id"])
-            copy_tree(str(self.path_run), run_stash)
-            remove_tree(self.path_run)
-            # Start with an empty set
-            self.assertEqual(self.proc.seqinfo["runs"], set())
-            proj_exp = {"active": set(), "inactive": set(), "completed": set()}
-            self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
-            # Refresh loads a number of Runs
-            self.proc.refresh()
-            self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"] - 1)
-            self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
-            # Still just those Runs
-            self.proc.refresh()
-            self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"] - 1)
-            self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
-            # Copy run directory back
-            copy_tree(run_stash, str(self.path_run))
-            # Now, we should load a new Run with refresh()
-            self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
-            self.proc.refresh(wait=True)
-            # All loaded runs are inactive since we're readonly.
-            self.assertEqual(self._proj_names("inactive"), ["STR", "Something Else"])
-            self.assertEqual(self._proj_names("completed"), [])
-            self.assertEqual(self._proj_names("active"), [])
-            self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"])
+        stash = self._stash_dir()
+        run_stash = stash/self.expected["run_id"]
+        os.rename(self.path_run, run_stash)
+        # Start with an empty set
+        self.assertEqual(self.proc.seqinfo["runs"], set())
+        proj_exp = {"active": set(), "inactive": set(), "completed": set()}
+        self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
+        # Refresh loads a number of Runs
+        self.proc.refresh()
+        self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"] - 1)
+        self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
+        # Still just those Runs
+        self.proc.refresh()
+        self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"] - 1)
+        self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
+        # Move run directory back
+        os.rename(run_stash, self.path_run)
+        # Now, we should load a new Run with refresh()
+        self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
+        self.proc.refresh(wait=True)
+        # All loaded runs are inactive since we're readonly.
+        self.assertEqual(self._proj_names("inactive"), ["STR", "Something Else"])
+        self.assertEqual(self._proj_names("completed"), [])
+        self.assertEqual(self._proj_names("active"), [])
+        self.assertEqual(len(self.proc.seqinfo["runs"]), self.expected["num_runs"])
 
 
 class TestIlluminaProcessorReportConfig(TestIlluminaProcessor):
@@ -396,39 +407,38 @@ class TestIlluminaProcessorMinRunAge(TestIlluminaProcessor):
 
         Also, once a skipped run is logged it should not be logged again.
         """
-        with TemporaryDirectory() as stash:
-            run_stash = str(Path(stash)/self.expected["run_id"])
-            copy_tree(str(self.path_run), run_stash)
-            remove_tree(self.path_run)
-            # Start with an empty set
-            self.assertEqual(self.proc.seqinfo["runs"], set())
-            proj_exp = {"active": set(), "inactive": set(), "completed": set()}
-            self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
-            logger = umbra.processor.LOGGER
-            # Refresh loads a number of Runs
-            handler = DumbLogHandler()
-            logger.addHandler(handler)
-            logger.setLevel(logging.INFO)
-            self.proc.refresh()
-            self.assertTrue(
-                handler.has_message_text("skipping run; timestamp"),
-                "Run skipped but not logged as expected")
-            handler.records = []
-            self.assertEqual(self.proc.seqinfo["runs"], set())
-            self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
-            # Copy run directory back
-            copy_tree(run_stash, str(self.path_run))
-            # Now, we should load a new Run with refresh()
-            self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
-            self.proc.start()
-            self.proc.refresh(wait=True)
-            self.assertFalse(
-                handler.has_message_text("skipping run; timestamp"),
-                "Run already skipped but incorrectly logged again")
-            # Except we still haven't loaded any yet (too new)
-            self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
-            logger.removeHandler(handler)
-            logger.setLevel(logging.NOTSET)
+        stash = self._stash_dir()
+        run_stash = stash/self.expected["run_id"]
+        os.rename(self.path_run, run_stash)
+        # Start with an empty set
+        self.assertEqual(self.proc.seqinfo["runs"], set())
+        proj_exp = {"active": set(), "inactive": set(), "completed": set()}
+        self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
+        logger = umbra.processor.LOGGER
+        # Refresh loads a number of Runs
+        handler = DumbLogHandler()
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        self.proc.refresh()
+        self.assertTrue(
+            handler.has_message_text("skipping run; timestamp"),
+            "Run skipped but not logged as expected")
+        handler.records = []
+        self.assertEqual(self.proc.seqinfo["runs"], set())
+        self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
+        # Move run directory back
+        os.rename(run_stash, self.path_run)
+        # Now, we should load a new Run with refresh()
+        self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
+        self.proc.start()
+        self.proc.refresh(wait=True)
+        self.assertFalse(
+            handler.has_message_text("skipping run; timestamp"),
+            "Run already skipped but incorrectly logged again")
+        # Except we still haven't loaded any yet (too new)
+        self.assertEqual(self.proc.seqinfo["projects"], proj_exp)
+        logger.removeHandler(handler)
+        logger.setLevel(logging.NOTSET)
 
 
 class TestIlluminaProcessorMinRunAgeZero(TestIlluminaProcessor):
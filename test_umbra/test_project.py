@@ -10,12 +10,12 @@ multiple simultaneous projects, either; see test_umbra.py for that.
 """
 
 import unittest
-from unittest.mock import Mock
-import warnings
+from unittest.mock import Mock, patch
 import datetime
 import logging
 from pathlib import Path
-import yaml
+from umbra import util
+from umbra import task
 from umbra.illumina.run import Run
 from umbra.project import ProjectData, ProjectError
 from .test_common import TestBaseHeavy
@@ -167,12 +167,116 @@ class TestProjectData(TestBaseHeavy):
             self.projs["STR"].status = "invalid status"
         # is the setter magically keeping the data on disk up to date?
         self.projs["Something Else"].status = "processing"
-        with open(self.projs["Something Else"].path) as f_in:
-            # https://stackoverflow.com/a/1640777
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore", category=DeprecationWarning)
-                data = yaml.safe_load(f_in)
-            self.assertEqual(data["status"], "processing")
+        data = util.yaml_load(self.projs["Something Else"].path)
+        self.assertEqual(data["status"], "processing")
+
+    def test_save_metadata_failure(self):
+        """Test that a failed metadata write leaves nothing behind."""
+        proj = self.projs["Something Else"]
+        before = sorted(proj.path.parent.iterdir())
+        text = proj.path.read_text()
+        with patch("umbra.project.os.replace", side_effect=OSError):
+            with self.assertRaises(OSError):
+                proj.status = "processing"
+        self.assertEqual(sorted(proj.path.parent.iterdir()), before)
+        self.assertEqual(proj.path.read_text(), text)
+
+    def test_save_metadata_mode(self):
+        """Test that rewriting the metadata keeps its file permissions."""
+        proj = self.projs["Something Else"]
+        proj.path.chmod(0o640)
+        # The process-wide umask is left alone, since other threads may be
+        # creating files at the same time.
+        with patch("umbra.project.os.umask", side_effect=AssertionError):
+            proj.status = "processing"
+        self.assertEqual(proj.path.stat().st_mode & 0o7777, 0o640)
+
+    def test_sample_paths(self):
+        """Test that callers can't modify the cached sample paths."""
+        proj = self.projs["Something Else"]
+        paths = proj.sample_paths
+        self.assertTrue(paths)
+        samp = next(iter(paths))
+        expected = list(paths[samp])
+        paths[samp].append(Path("extra.fastq.gz"))
+        del paths[samp]
+        self.assertEqual(proj.sample_paths[samp], expected)
+
+    def test_setup_exp_info_other_projects(self):
+        """Test that other projects' spreadsheet rows are ignored."""
+        # pylint: disable=protected-access
+        proj = self.projs["Something Else"]
+        rows = [
+            {"Sample_Name": "a", "Project": "STR",
+             "Contacts": {"Jesse": "ancon@upenn.edu"}, "Tasks": ["trim"]},
+            {"Sample_Name": "b ", "Project": "Something Else",
+             "Contacts": {"Someone": "person@gmail.com"}, "Tasks": []}]
+        self.assertEqual(
+            proj._setup_exp_info(rows),
+            {"sample_names": ["b"], "tasks": [],
+             "contacts": {"Someone": "person@gmail.com"}})
+
+    def test_deps_completed(self):
+        """Test checking for completed dependencies, direct and indirect."""
+        proj = self.projs["Something Else"]
+        self.assertTrue(proj.deps_completed("copy"))
+        self.assertFalse(proj.deps_completed("package"))
+        self.assertFalse(proj.deps_completed("email"))
+        proj.tasks_completed.extend(["metadata", "package"])
+        self.assertTrue(proj.deps_completed("package"))
+        self.assertFalse(proj.deps_completed("email"))
+        proj.tasks_completed.append("upload")
+        self.assertTrue(proj.deps_completed("email"))
+
+    def test_setup_tasks_replaced_dependency(self):
+        """Test that a replaced dependency-only task class gets used."""
+        # pylint: disable=protected-access
+        proj = self.projs["Something Else"]
+        proj.experiment_info["tasks"] = ["merge"]
+        tasks, _ = proj._setup_tasks()
+        classes = task.task_classes()
+        self.assertIn(classes["trim"], [type(obj) for obj in tasks])
+        # A custom task replacing a built-in one has the same class name
+        class TaskTrim(classes["trim"]):
+            """Stand-in for a custom trim task."""
+        classes["trim"] = TaskTrim
+        with patch("umbra.project.task.task_classes", return_value=classes):
+            tasks, _ = proj._setup_tasks()
+        self.assertIn(TaskTrim, [type(obj) for obj in tasks])
+
+    def test_task_groups(self):
+        """Test which tasks run together and how they share threads."""
+        # pylint: disable=protected-access
+        proj = self.projs["Something Else"]
+        proj.nthreads = 4
+        nthreads_seen = {}
+        def fake_task(name, order, concurrent):
+            taskobj = Mock(order=order, concurrent=concurrent, nthreads=None)
+            def runwrapper():
+                nthreads_seen[name] = taskobj.nthreads
+            taskobj.runwrapper.side_effect = runwrapper
+            return taskobj
+        # Only neighboring tasks that are both marked concurrent and have the
+        # same order run together.  Tasks left at the defaults run alone.
+        proj._tasks_by_name = {
+            "a": fake_task("a", 11, True),
+            "b": fake_task("b", 11, True),
+            "c": fake_task("c", 12, True),
+            "d": fake_task("d", 100, False),
+            "e": fake_task("e", 100, False)}
+        proj._task_deps = {name: frozenset() for name in proj._tasks_by_name}
+        proj.tasks_pending[:] = ["a", "b", "c", "d", "e"]
+        groups = []
+        while proj.tasks_pending:
+            groups.append(proj._next_task_group())
+            proj._run_task_group(groups[-1])
+        self.assertEqual(groups, [["a", "b"], ["c"], ["d"], ["e"]])
+        self.assertEqual(proj.tasks_completed, ["a", "b", "c", "d", "e"])
+        # The tasks running together split the project's threads, and go back
+        # to the project's setting afterward.
+        self.assertEqual(
+            nthreads_seen, {"a": 2, "b": 2, "c": None, "d": None, "e": None})
+        self.assertIsNone(proj._tasks_by_name["a"].nthreads)
 
     def test_process(self):
         """Test the process method to actually run all tasks.
@@ -2,6 +2,7 @@
 Test for single-task "copy".
 """
 
+import os
 from .test_project_task import TestProjectDataOneTask
 
 class TestProjectDataCopy(TestProjectDataOneTask):
@@ -23,11 +24,11 @@ class TestProjectDataCopy(TestProjectDataOneTask):
         # default Metadata directory.
         dirpath = self.proj.path_proc
         dir_exp = sorted(["Metadata", "logs", self.runobj.run_id])
-        dir_obs = sorted([x.name for x in dirpath.glob("*")])
+        dir_obs = sorted(os.listdir(dirpath))
         self.assertEqual(dir_obs, dir_exp)
         # The files in the top-level of the run directory should match, too.
-        files_in = lambda d, s: [x.name for x in d.glob(s) if x.is_file()]
-        files_exp = sorted(files_in(self.runobj.path, "*"))
-        files_obs = sorted(files_in(dirpath / self.runobj.run_id, "*"))
+        files_in = lambda d: [x.name for x in os.scandir(d) if x.is_file()]
+        files_exp = sorted(files_in(self.runobj.path))
+        files_obs = sorted(files_in(dirpath / self.runobj.run_id))
         self.assertEqual(files_obs, files_exp)
         self.check_zipfile(files_exp)
@@ -2,6 +2,7 @@
 Test for single-task "merge".
 """
 
+import os
 import re
 import unittest
 from .test_project_task import TestProjectDataOneTask, DEFAULT_TASKS
@@ -39,7 +40,7 @@ class TestProjectDataMerge(TestProjectDataOneTask):
         # Now, do they match?
         self.assertEqual(fastq_obs, fastq_exp)
         # Was anything else in there?  Shouldn't be.
-        files_all = [x.name for x in dirpath.glob("*")]
+        files_all = os.listdir(dirpath)
         files_all = sorted(files_all)
         self.assertEqual(files_all, fastq_exp)
         # Did the specific read pair we created get merged as expected?
@@ -52,16 +52,12 @@ class TestProjectDataMetadata(TestProjectDataOneTask):
         # We need a more nuanced experiment metadata spreadsheet here to test
         # that only this project's rows are copied.
         fieldnames = ["Sample_Name", "Project", "Contacts", "Tasks"]
-        exp_row = lambda sample_name, pname: {
-            "Sample_Name": sample_name,
-            "Project": pname,
-            "Contacts": self.contacts_str,
-            "Tasks": self.task
-            }
+        exp_row = lambda sample_name, pname: [
+            sample_name, pname, self.contacts_str, self.task]
         sample_names_extra = ["1086S1_05", "1086S2_01", "1086S2_02", "1086S2_03"]
         with open(self.expected["experiment_path"], "w", newline="") as f_out:
-            writer = csv.DictWriter(f_out, fieldnames)
-            writer.writeheader()
+            writer = csv.writer(f_out)
+            writer.writerow(fieldnames)
             for sample_name in self.expected["sample_names"]:
                 writer.writerow((exp_row(sample_name, self.project_name)))
             for sample_name in sample_names_extra:
@@ -2,6 +2,7 @@
 Test for single-task "trim".
 """
 
+import os
 from .test_project_task import TestProjectDataOneTask
 
 class TestProjectDataTrim(TestProjectDataOneTask):
@@ -31,7 +32,7 @@ class TestProjectDataTrim(TestProjectDataOneTask):
         # Now, do they match?
         self.assertEqual(fastq_obs, fastq_exp)
         # Was anything else in there?  Shouldn't be.
-        files_all = [x.name for x in dirpath.glob("*")]
+        files_all = os.listdir(dirpath)
         files_all = sorted(files_all)
         self.assertEqual(files_all, fastq_exp)
         # Did the specific read pair we created get trimmed as expected?
@@ -5,14 +5,16 @@ This tests general behavior of the class and a hypothetical instance.  See the
 other test_task_* modules for specific cases.
 """
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 import tempfile
 import logging
+import threading
 import importlib
 from pathlib import Path
 from umbra import task
-from ..test_common import TestBase
+from ..test_common import TestBase, TMPDIR
 
 
 class TestTaskModule(TestBase):
@@ -112,6 +114,10 @@ class TestTaskClass(TestBase):
         """Test that the numeric order attribute is defined."""
         self.assertEqual(self.thing.order, 100)
 
+    def test_concurrent(self):
+        """Test that tasks don't run alongside others by default."""
+        self.assertFalse(self.thing.concurrent)
+
     def test_dependencies(self):
         """Test that the dependency list is defined."""
         self.assertEqual(self.thing.dependencies, [])
@@ -159,7 +165,7 @@ class TestTask(TestTaskClass):
 
     def setUp(self, task_class=task.Task):
         # pylint: disable=arguments-differ
-        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tmpdir = tempfile.TemporaryDirectory(dir=TMPDIR)
         dir_proc = Path(self.tmpdir.name) / "proc"
         # set up a mock project object for testing
         self.proj = Mock(
@@ -195,6 +201,69 @@ class TestTask(TestTaskClass):
     def test_nthreads(self):
         """Check number of threads configured for processing."""
         self.assertEqual(self.thing.nthreads, 1)
+        # It can be set for the one task, and unset back to the project's.
+        self.thing.nthreads = 2
+        self.assertEqual(self.thing.nthreads, 2)
+        self.assertEqual(self.proj.nthreads, 1)
+        self.thing.nthreads = None
+        self.assertEqual(self.thing.nthreads, 1)
+
+    def test_map_samples(self):
+        """Check calling a function for each sample, and error handling."""
+        seen = []
+        self.thing.map_samples(lambda samp, paths: seen.append((samp, paths)))
+        self.assertEqual(seen, list(self.proj.sample_paths.items()))
+        def fail(samp, _paths):
+            raise ValueError(samp)
+        with self.assertRaises(ValueError):
+            self.thing.map_samples(fail, 2)
+        # Once one sample fails, any not yet started are cancelled.  The one
+        # worker may already have picked up the next sample by then.
+        started, futures = self.map_samples_failing("sample0", 1)
+        self.assertIn(started, [{"sample0"}, {"sample0", "sample1"}])
+        self.assertTrue(all(future.cancelled() for future in futures[2:]))
+
+    def test_map_samples_later_failure(self):
+        """Check that a later sample failing doesn't wait on earlier ones."""
+        # sample0 is still running (until the executor shuts down) when
+        # sample1 fails, and the second worker may have picked up sample2.
+        started, futures = self.map_samples_failing("sample1", 2)
+        self.assertIn(
+            started,
+            [{"sample0", "sample1"}, {"sample0", "sample1", "sample2"}])
+        self.assertTrue(all(future.cancelled() for future in futures[3:]))
+
+    def map_samples_failing(self, failing, nworkers):
+        """Run map_samples over ten samples, one of which fails.
+
+        Every other sample waits until the executor is shutting down, which
+        only happens after map_samples has cancelled what's left.  Returns
+        the set of samples started and the list of futures.
+        """
+        started = set()
+        futures = []
+        release = threading.Event()
+        class Executor(ThreadPoolExecutor):
+            """ThreadPoolExecutor that keeps its futures and releases samples."""
+            def submit(self, *args, **kwargs):
+                future = super().submit(*args, **kwargs)
+                futures.append(future)
+                return future
+            def shutdown(self, *args, **kwargs):
+                release.set()
+                super().shutdown(*args, **kwargs)
+        def func(samp, _paths):
+            started.add(samp)
+            if samp == failing:
+                raise ValueError(samp)
+            # (A timeout just so a regression fails rather than hangs)
+            release.wait(10)
+        many = {"sample%d" % idx: [] for idx in range(10)}
+        with patch("umbra.task.ThreadPoolExecutor", Executor):
+            with self.assertRaises(ValueError):
+                self.thing.map_samples(func, nworkers, many)
+        self.assertEqual(len(futures), 10)
+        return started, futures
 
     def test_run(self):
         """Test that the run method is left unimplemented by default."""
@@ -328,7 +397,7 @@ class TestTaskImplicit(TestTask):
 
     def setUp(self):
         # pylint: disable=arguments-differ
-        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tmpdir = tempfile.TemporaryDirectory(dir=TMPDIR)
         # set up a mock project object for testing
         self.proj = Mock(
             path_proc=Path(self.tmpdir.name) / "proc",
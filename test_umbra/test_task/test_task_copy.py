@@ -2,6 +2,7 @@
 Test TaskCopy.
 """
 
+import os
 from pathlib import Path
 from umbra import task
 from . import test_task
@@ -12,6 +13,12 @@ class TestTaskCopy(test_task.TestTask):
     def setUp(self):
         # pylint: disable=no-member,arguments-differ
         super().setUp(task.TaskCopy)
+        self.path_run = Path(self.tmpdir.name) / "runs" / "run_id"
+        (self.path_run / "Data" / "Intensities").mkdir(parents=True)
+        (self.path_run / "RTAComplete.txt").write_text("complete\n")
+        (self.path_run / "Data" / "Intensities" / "file.txt").write_text("data\n")
+        self.proj.alignment.run.path = self.path_run
+        self.proj.alignment.run.run_id = "run_id"
 
     def test_name(self):
         self.assertEqual(self.thing.name, "copy")
@@ -39,7 +46,19 @@ class TestTaskCopy(test_task.TestTask):
         self.assertEqual(self.thing.summary, summary_expected)
 
     def test_run(self):
-        self.skipTest("not yet implemented")
+        self.thing.run()
+        self.check_run_results()
 
     def test_runwrapper(self):
-        self.skipTest("not yet implemented")
+        self.thing.runwrapper()
+        self.check_run_results()
+
+    def check_run_results(self):
+        """Check that the run directory's files were linked into place."""
+        dest = self.proj.path_proc / "run_id"
+        for relpath in ["RTAComplete.txt", "Data/Intensities/file.txt"]:
+            src_file = self.path_run / relpath
+            dest_file = dest / relpath
+            self.assertTrue(dest_file.is_file())
+            self.assertEqual(dest_file.read_text(), src_file.read_text())
+            self.assertTrue(os.path.samefile(src_file, dest_file))
@@ -3,8 +3,13 @@ Test TaskMerge.
 """
 
 import shutil
+import unittest
+from tempfile import TemporaryDirectory
 from pathlib import Path
 from umbra import task
+from umbra.task.task_merge import interleave_pair
+from umbra.util import ProjectError
+from ..test_common import TMPDIR
 from . import test_task
 
 class TestTaskMerge(test_task.TestTask):
@@ -30,6 +35,10 @@ class TestTaskMerge(test_task.TestTask):
         """Test that the numeric order attribute is defined."""
         self.assertEqual(self.thing.order, 11)
 
+    def test_concurrent(self):
+        """Test that this task can run alongside others."""
+        self.assertTrue(self.thing.concurrent)
+
     def test_dependencies(self):
         """Test that the dependency list is defined."""
         self.assertEqual(self.thing.dependencies, ["trim"])
@@ -79,3 +88,53 @@ class TestTaskMergeManyContigs(TestTaskMerge):
     Follows the same pattern as TestTaskTrim and TestTaskTrimManyContigs; see
     the supporting files for the different input/output sets by class name.
     """
+
+
+class TestInterleavePair(unittest.TestCase):
+    """Test interleave_pair directly with small hand-written FASTQs."""
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory(dir=TMPDIR)
+        self.dir = Path(self.tmpdir.name)
+        self.fq_out = self.dir / "out.fastq"
+        self.fqs_in = [self.dir / "R1.fastq", self.dir / "R2.fastq"]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_inputs(self, text_r1, text_r2):
+        """Write the given text to the R1 and R2 input files."""
+        self.fqs_in[0].write_text(text_r1)
+        self.fqs_in[1].write_text(text_r2)
+
+    def test_interleave(self):
+        """Test that records alternate, with a final newline added if needed."""
+        self.write_inputs(
+            "@r1/1\nACGT\n+\nIIII\n@r2/1\nGG\n+\nII",
+            "@r1/2\nTTTT\n+\nIIII\n@r2/2\nCC\n+\nII\n")
+        interleave_pair(self.fq_out, self.fqs_in)
+        self.assertEqual(
+            self.fq_out.read_text(),
+            "@r1/1\nACGT\n+\nIIII\n@r1/2\nTTTT\n+\nIIII\n"
+            "@r2/1\nGG\n+\nII\n@r2/2\nCC\n+\nII\n")
+
+    def test_mismatched(self):
+        """Test that differing read counts raise ProjectError."""
+        self.write_inputs(
+            "@r1/1\nACGT\n+\nIIII\n@r2/1\nGG\n+\nII\n",
+            "@r1/2\nTTTT\n+\nIIII\n")
+        with self.assertRaises(ProjectError):
+            interleave_pair(self.fq_out, self.fqs_in)
+
+    def test_malformed(self):
+        """Test that truncated or malformed records raise ProjectError."""
+        good = "@r1/2\nTTTT\n+\nIIII\n"
+        for bad in [
+                "@r1/1\nACGT\n+\n",
+                "r1/1\nACGT\n+\nIIII\n",
+                "@r1/1\nACGT\n-\nIIII\n",
+                "@r1/1\nACGT\n+\nIII\n"]:
+            with self.subTest(bad=bad):
+                self.write_inputs(bad, good)
+                with self.assertRaises(ProjectError):
+                    interleave_pair(self.fq_out, self.fqs_in)
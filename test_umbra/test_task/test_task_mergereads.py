@@ -31,6 +31,10 @@ class TestTaskMergeReads(test_task.TestTask):
         """Test that the numeric order attribute is defined."""
         self.assertEqual(self.thing.order, 11)
 
+    def test_concurrent(self):
+        """Test that this task can run alongside others."""
+        self.assertTrue(self.thing.concurrent)
+
     def test_dependencies(self):
         """Test that the dependency list is defined."""
         self.assertEqual(self.thing.dependencies, ["trim"])
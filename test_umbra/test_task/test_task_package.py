@@ -2,6 +2,8 @@
 Test TaskPackage.
 """
 
+import gzip
+import zipfile
 from pathlib import Path
 from umbra import task
 from . import test_task
@@ -12,6 +14,17 @@ class TestTaskPackage(test_task.TestTask):
     def setUp(self):
         # pylint: disable=no-member,arguments-differ
         super().setUp(task.TaskPackage)
+        self.proj.path_pack = Path(self.tmpdir.name) / "pack" / "work_dir_name.zip"
+        # A couple of files to archive: one plain text and one already
+        # gzipped.
+        dir_proc = Path(self.tmpdir.name) / "proc"
+        (dir_proc / "trimmed").mkdir(parents=True)
+        with open(dir_proc / "trimmed" / "sample.fastq", "w") as f_out:
+            f_out.write("@read\n" + "ACTG" * 25 + "\n+\n" + "I" * 100 + "\n")
+        with gzip.open(dir_proc / "sample.fastq.gz", "wt") as f_out:
+            f_out.write("@read\n" + "ACTG" * 25 + "\n+\n" + "I" * 100 + "\n")
+        # Extensions are checked without regard to case
+        (dir_proc / "plot.PNG").write_bytes(b"\x89PNG\r\n\x1a\n")
 
     def test_name(self):
         self.assertEqual(self.thing.name, "package")
@@ -39,7 +52,28 @@ class TestTaskPackage(test_task.TestTask):
         self.assertEqual(self.thing.summary, summary_expected)
 
     def test_run(self):
-        self.skipTest("not yet implemented")
+        self.thing.run()
+        self.check_run_results()
 
     def test_runwrapper(self):
-        self.skipTest("not yet implemented")
+        self.thing.runwrapper()
+        self.check_run_results()
+
+    def check_run_results(self):
+        """Check the zipfile's contents and compression.
+
+        Everything under the processing directory should be archived relative
+        to its parent directory, with already-compressed files stored as-is
+        and everything else deflated.
+        """
+        with zipfile.ZipFile(self.proj.path_pack) as f_zip:
+            info = {item.filename: item for item in f_zip.infolist()}
+        self.assertIn("proc/sample.fastq.gz", info)
+        self.assertIn("proc/trimmed/sample.fastq", info)
+        self.assertEqual(
+            info["proc/sample.fastq.gz"].compress_type, zipfile.ZIP_STORED)
+        self.assertIn("proc/plot.PNG", info)
+        self.assertEqual(
+            info["proc/trimmed/sample.fastq"].compress_type, zipfile.ZIP_DEFLATED)
+        self.assertEqual(
+            info["proc/plot.PNG"].compress_type, zipfile.ZIP_STORED)
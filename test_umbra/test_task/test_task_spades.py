@@ -89,6 +89,17 @@ class TestTaskSpades(test_task.TestTask):
         self.thing.runwrapper()
         self.check_run_results()
 
+    def test_run_empty(self):
+        """Test that empty input gets placeholder contigs without spades."""
+        for fastq in (self.proj.path_proc / "PairedReads").glob("*.fastq"):
+            fastq.write_text("")
+        self.thing.runwrapper()
+        self.assertFalse(Path(os.environ["TEST_LOG"]).exists())
+        contigs = (
+            self.proj.path_proc / "assembled" /
+            "sample_S1_L001_R_001" / "contigs.fasta")
+        self.assertEqual(contigs.stat().st_size, 0)
+
     def check_run_results(self):
         """Check that spades.py was called as expected."""
         with open(os.environ["TEST_LOG"]) as log:
@@ -4,6 +4,7 @@ Test TaskTrim.
 
 import shutil
 from pathlib import Path
+from unittest.mock import patch
 from umbra import task
 from . import test_task
 
@@ -52,6 +53,25 @@ class TestTaskTrim(test_task.TestTask):
         self.thing.runwrapper()
         self.check_run_results()
 
+    def test_run_multicore(self):
+        """Test run with spare threads given to cutadapt itself."""
+        self.proj.nthreads = 2
+        ncores = 2 // min(2, len(self.thing.sample_paths))
+        with patch.object(
+                self.thing, "runcmd", wraps=self.thing.runcmd) as runcmd:
+            self.thing.run()
+        self.check_run_results()
+        # Each cutadapt call should get the leftover cores via -j, and only
+        # when there's more than one to give.
+        self.assertTrue(runcmd.call_args_list)
+        for call in runcmd.call_args_list:
+            args = call[0][0]
+            self.assertEqual(args[0], "cutadapt")
+            if ncores > 1:
+                self.assertEqual(args[1:3], ["-j", str(ncores)])
+            else:
+                self.assertNotIn("-j", args)
+
     def check_run_results(self):
         """Compare observed file outputs with expected.
 
@@ -13,7 +13,7 @@ from pathlib import Path
 import yaml
 import boxsdk
 from boxsdk.exception import (BoxAPIException, BoxOAuthException)
-from .util import yaml_load
+from .util import yaml_load, YAMLDumper
 
 LOGGER = logging.getLogger(__name__)
 
@@ -77,7 +77,7 @@ class BoxHandler:
         self.creds["user_access_token"] = access_token
         self.creds["user_refresh_token"] = refresh_token
         with open(self.creds_store_path, "w") as fout:
-            fout.write(yaml.dump(self.creds))
+            fout.write(yaml.dump(self.creds, Dumper=YAMLDumper))
         LOGGER.info("Tokens refreshed.")
 
     def _init_client_wrapper(self):
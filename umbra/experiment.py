@@ -9,6 +9,11 @@ import csv
 import re
 from .illumina.util import load_csv
 
+# Patterns for parsing contact text; see _parse_contacts.
+_CONTACT_SEP = re.compile("[,;]+")
+_CONTACT_NAME_EMAIL = re.compile(r" *([\w ]* *[\w]+) *<(.*@.*)>")
+_CONTACT_EMAIL = re.compile(r"([^@]*)(@[^@])")
+
 def _parse_contacts(text):
     """Create a dictionary of name/email pairs from contact text.
 
@@ -18,7 +23,7 @@ def _parse_contacts(text):
     {'Name': 'email@example.com', 'Someone Else': 'user@site.gov'}
     """
 
-    chunks = re.split("[,;]+", text)
+    chunks = _CONTACT_SEP.split(text)
     contacts = {}
     for chunk in chunks:
         if not chunk:
@@ -26,14 +31,14 @@ def _parse_contacts(text):
         # There's a horrible rabbit hole to go down trying to figure out
         # parsing email addresses with regular expressions.  I don't care.
         # This is enough for us.
-        match = re.match(r" *([\w ]* *[\w]+) *<(.*@.*)>", chunk)
+        match = _CONTACT_NAME_EMAIL.match(chunk)
         if match:
             # First case, Name [Lastname] <email@something>
             name = match.group(1)
             email = match.group(2)
         else:
             # Second case, just email@something
-            match = re.match(r"([^@]*)(@[^@])", chunk)
+            match = _CONTACT_EMAIL.match(chunk)
             name = match.group(1)
             email = chunk
         contacts[name] = email
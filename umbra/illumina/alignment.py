@@ -63,7 +63,11 @@ class Alignment:
 
         If the alignment has just completed, and a callback function was
         provided during instantiation, call it."""
-        self.__path_attrs = load_sample_filenames(self.paths["fastq"])
+        # Group the file info by sample number so that finding each sample's
+        # files doesn't mean searching through every file in the directory.
+        self.__path_attrs = {}
+        for attrs in load_sample_filenames(self.paths["fastq"]):
+            self.__path_attrs.setdefault(attrs["sample_num"], []).append(attrs)
         if (self.run is None or self.run.complete) and not self.complete:
             self.checkpoint = load_checkpoint(self.paths["checkpoint"])
             if self.complete and self.completion_callback:
@@ -151,8 +155,8 @@ class Alignment:
             reads = ["R1", "R2"]
         else:
             reads = ["R1"]
-        for attrs in self.__path_attrs:
-            if attrs["sample_num"] == sample_num and attrs["read"] in reads:
+        for attrs in self.__path_attrs.get(sample_num, []):
+            if attrs["read"] in reads:
                 # This replicates the existing behavior where we only deliver
                 # R1 and then also R2 if expected, and never I1 or I2.  This
                 # should be changed at some point to account for I1 and I2
@@ -18,6 +18,12 @@ ADAPTERS = {
             ]
         }
 
+# Section names in sample sheets, like [Header]
+_SECTION_NAME = re.compile("\\[([A-Za-z0-9]+)\\]")
+# Demultiplexed read filenames, like Sample_S1_L001_R1_001.fastq.gz
+_FASTQ_NAME = re.compile(
+    r"^(.+)_S([0-9]+)_L([0-9]{3})_(R1|R2|I1|I2)_([0-9]+)\.fastq\.gz$")
+
 def load_xml(path):
     """Load an XML file and return the root element."""
     elem = xml.etree.ElementTree.parse(path).getroot()
@@ -51,7 +57,7 @@ def load_csv(path, loader=csv.reader, non_unicode=None):
         errors_mode = "strict"
     elif non_unicode == "strip":
         errors_mode = "replace"
-        mapfunc = lambda x: re.sub("\N{REPLACEMENT CHARACTER}", "", x)
+        mapfunc = lambda x: x.replace("\N{REPLACEMENT CHARACTER}", "")
     else:
         raise ValueError('non_unicode should be one of None, "replace", "mask"')
     # Explicitly setting the encoding to utf-8-sig allows the byte order mark
@@ -82,7 +88,7 @@ def load_sample_sheet(path):
             continue
         # Check for section name like [Header].  If found, initialize a section
         # with that name.
-        match = re.match("\\[([A-Za-z0-9]+)\\]", row[0])
+        match = _SECTION_NAME.match(row[0])
         if match:
             name = match.group(1)
             data[name] = []
@@ -176,8 +182,7 @@ def load_sample_filenames(dirpath):
     """
     path_attrs = []
     for path in Path(dirpath).glob("*.fastq.gz"):
-        match = re.match(
-            r"^(.+)_S([0-9]+)_L([0-9]{3})_(R1|R2|I1|I2)_([0-9]+)\.fastq\.gz$", path.name)
+        match = _FASTQ_NAME.match(path.name)
         if not match:
             continue
         fields = ["prefix", "sample_num", "lane", "read", "suffix"]
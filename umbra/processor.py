@@ -4,6 +4,7 @@ Manage a directory of Illumina run data and coordinate processing.
 See IlluminaProcessor class for usage.
 """
 
+import os
 import sys
 import queue
 import threading
@@ -348,9 +349,22 @@ class IlluminaProcessor:
 
     def _load_new_runs(self):
         old_dirs = {run.path for run in self.seqinfo["runs"]}
-        run_dirs = [Path(d).resolve() for d in self.paths["runs"].glob("*")]
-        is_new_run_dir = lambda d: d.is_dir() and d not in old_dirs
-        run_dirs = [d for d in run_dirs if is_new_run_dir(d)]
+        # This runs on every refresh, so lean on the file types scandir
+        # already gives us rather than stat-ing every entry again.  The runs
+        # directory path is already resolved, so only symlinked entries need
+        # resolving to match the canonical paths stored in each Run.
+        try:
+            entries = list(os.scandir(self.paths["runs"]))
+        except FileNotFoundError:
+            entries = []
+        run_dirs = []
+        for entry in entries:
+            if entry.is_dir():
+                run_dir = Path(entry.path)
+                if entry.is_symlink():
+                    run_dir = run_dir.resolve()
+                if run_dir not in old_dirs:
+                    run_dirs.append(run_dir)
         runs = {self._run_setup(run_dir) for run_dir in run_dirs}
         runs = {run for run in runs if run}
         self.seqinfo["runs"] |= runs
@@ -12,22 +12,53 @@ that may arise (e.g., attempting to process a readonly project, existing files
 in the processing output directory, unexpected input data formats, etc).
 """
 
+import os
 import traceback
 import logging
-import re
 import sys
 import warnings
 import copy
+import functools
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import yaml
 from . import CONFIG
 from . import config
 from . import experiment
-from .util import ProjectError, mkparent, slugify, datestamp, yaml_load
+from .util import (
+    ProjectError, mkparent, slugify, datestamp, yaml_load, YAMLDumper)
 from . import task
 
 LOGGER = logging.getLogger(__name__)
 
+# Many projects (and their metadata files and work_dir names) share the same
+# names, contacts, run dates, and flowcells, so these results are reused.
+@functools.lru_cache(maxsize=1024)
+def _slugify_cached(text):
+    """slugify, remembering previous results."""
+    return slugify(text)
+
+@functools.lru_cache(maxsize=1024)
+def _datestamp_cached(dateobj):
+    """datestamp, remembering previous results."""
+    return datestamp(dateobj)
+
+def _deps_for(tasks_all, tasknames):
+    """Get all dependent tasks' names (including indirect) for some tasks.
+
+    tasks_all is the dictionary of Task classes by name, as from
+    task.task_classes()."""
+    # Single pass over a worklist of names not yet expanded
+    total = set()
+    todo = list(tasknames)
+    while todo:
+        for dep in tasks_all[todo.pop()].dependencies:
+            if dep not in total:
+                total.add(dep)
+                todo.append(dep)
+    return total
+
 class ProjectData:
     """The data for a Run and Alignment specific to one project.
 
@@ -47,6 +78,10 @@ class ProjectData:
     FAILED = "failed"
     STATUS = [NONE, PROCESSING, PACKAGE_READY, COMPLETE, FAILED]
 
+    # Task plans already worked out, keyed by the set of task classes
+    # initially requested.  See _setup_tasks.
+    _TASK_PLANS = {}
+
     @staticmethod
     def from_alignment(alignment, path_exp, dp_align, dp_proc, dp_pack,
                        uploader, mailer, nthreads=1, readonly=False,
@@ -95,12 +130,15 @@ class ProjectData:
                     msg += "Alignment: %s\n" % alignment.path
                     msg += "File:      %s\n" % exception.filename
                     warnings.warn(msg)
-                # Set of unique names in the experiment spreadsheet
-                names = {row["Project"] for row in experiment_info}
+                # Spreadsheet rows grouped by each unique project name, so each
+                # project only needs to look at its own rows
+                rows_by_name = {}
+                for row in experiment_info:
+                    rows_by_name.setdefault(row["Project"], []).append(row)
                 run_id = alignment.run.run_id
                 al_idx = str(alignment.index)
-                for name in names:
-                    proj_file = slugify(name) + ".yml"
+                for name, rows in rows_by_name.items():
+                    proj_file = _slugify_cached(name) + ".yml"
                     fpath = Path(dp_align) / run_id / al_idx / proj_file
                     proj = ProjectData(
                         name=name,
@@ -108,7 +146,7 @@ class ProjectData:
                         dp_proc=dp_proc,
                         dp_pack=dp_pack,
                         alignment=alignment,
-                        exp_info_full=experiment_info,
+                        exp_info_rows=rows,
                         uploader=uploader,
                         mailer=mailer,
                         exp_path=exp_path,
@@ -129,7 +167,7 @@ class ProjectData:
         return projects
 
     def __init__(
-            self, name, path, dp_proc, dp_pack, alignment, exp_info_full,
+            self, name, path, dp_proc, dp_pack, alignment, exp_info_rows,
             uploader, mailer, exp_path=None, nthreads=1, readonly=False,
             conf=None):
 
@@ -144,15 +182,34 @@ class ProjectData:
         self.conf = copy.deepcopy(CONFIG["task_options"])
         config.update_tree(self.conf, conf or {})
         self._metadata = {"status": ProjectData.NONE}
-        self.readonly = self.path.exists() or readonly
-        self.load_metadata()
+        # While processing, metadata writes are deferred and flushed once per
+        # task boundary rather than on every change.  See process().
+        self._save_deferred = False
+        self._dirty = False
+        # The YAML text last written to disk, to skip rewriting identical data
+        self._last_dump = None
+        # Path objects for sample_paths, built on first use
+        self._sample_paths_cache = None
+        # Has the metadata file's parent directory been created yet?
+        self._parent_dir_ensured = False
+        # Existing metadata on disk always means read-only, so a writable
+        # project never has anything to load (and its first write below is
+        # never a no-op rewrite of what's already there).
+        path_exists = self.path.exists()
+        self.readonly = path_exists or readonly
+        if path_exists:
+            self.load_metadata()
         self._metadata["alignment_info"] = {}
-        self._metadata["experiment_info"] = self._setup_exp_info(exp_info_full)
+        self._metadata["experiment_info"] = self._setup_exp_info(exp_info_rows)
         self._metadata["experiment_info"]["path"] = str(exp_path or "")
         self._metadata["run_info"] = {}
         self._metadata["sample_paths"] = {}
         self._metadata["work_dir"] = self._init_work_dir_name()
-        self.tasks = self._setup_tasks()
+        # The Task objects in order, and all dependencies (including
+        # indirect) of each task by name
+        self.tasks, self._task_deps = self._setup_tasks()
+        # The same Task objects, by name, for lookup when running each one
+        self._tasks_by_name = {obj.name: obj for obj in self.tasks}
         self._metadata["task_status"] = self._setup_task_status()
         self._metadata["task_output"] = {}
         if self.alignment:
@@ -176,15 +233,13 @@ class ProjectData:
         LOGGER.info("ProjectData initialized: %s", self.work_dir)
 
     def _init_work_dir_name(self):
-        txt_date = datestamp(self.alignment.run.rta_complete["Date"])
-        txt_proj = slugify(self.name)
+        txt_date = _datestamp_cached(self.alignment.run.rta_complete["Date"])
+        txt_proj = _slugify_cached(self.name)
         # first names of contacts given
         who = self.experiment_info["contacts"]
-        who = [txt.split(" ")[0] for txt in who.keys()]
-        who = "-".join(who)
-        txt_name = slugify(who)
-        txt_flowcell = re.sub("^[-0]+", "", self.alignment.run.flowcell)
-        txt_flowcell = slugify(txt_flowcell)
+        who = "-".join(txt.split(" ", 1)[0] for txt in who)
+        txt_name = _slugify_cached(who)
+        txt_flowcell = _slugify_cached(self.alignment.run.flowcell.lstrip("-0"))
         fields = [txt_date, txt_proj, txt_name, txt_flowcell]
         fields = [f for f in fields if f]
         dirname = "-".join(fields)
@@ -228,14 +283,17 @@ class ProjectData:
 
     @property
     def sample_paths(self):
-        """Dict mapping sample names to filesystem paths."""
-        paths = self._metadata["sample_paths"]
-        if not paths:
-            return {}
-        paths2 = {}
-        for k in paths:
-            paths2[k] = [Path(p) for p in paths[k]]
-        return paths2
+        """Dict mapping sample names to filesystem paths.
+
+        The Path objects are built once and cached, but each call gets its own
+        copy of the dict and lists, so changes made by a caller don't leak
+        into the cache.
+        """
+        if self._sample_paths_cache is None:
+            paths = self._metadata["sample_paths"] or {}
+            self._sample_paths_cache = {
+                k: [Path(p) for p in paths[k]] for k in paths}
+        return {k: list(v) for k, v in self._sample_paths_cache.items()}
 
     @sample_paths.setter
     def sample_paths(self, sample_paths):
@@ -252,6 +310,7 @@ class ProjectData:
         # other projects.)
         if sample_paths is None:
             raise ProjectError("sample paths not given from alignment")
+        self._sample_paths_cache = None
         from_exp = set(self.experiment_info["sample_names"])
         from_given = set(sample_paths.keys())
         keepers = from_exp & from_given
@@ -297,45 +356,60 @@ class ProjectData:
 
     @property
     def task_current(self):
-        """Name of task currently running."""
+        """Name of task currently running.
+
+        If concurrent tasks are running together this is the first of them (or
+        the one that failed, if any did).  See process()."""
         return self._metadata["task_status"]["current"]
 
     def deps_completed(self, taskname):
         """ Are all dependencies of a given task already completed?"""
-        deps = self.__deps_for(taskname)
-        remaining = [d for d in deps if d not in self.tasks_completed]
-        return not remaining
+        deps = self._task_deps.get(taskname)
+        if deps is None:
+            deps = _deps_for(task.task_classes(), [taskname])
+        return deps.issubset(self.tasks_completed)
 
     def process(self):
         """Run all tasks.
 
         This function will block until processing is complete.  Calling process
-        if readyonly=True or status != NONE raises ProjectError."""
+        if readyonly=True or status != NONE raises ProjectError.
+
+        Tasks run one at a time in order, except that neighboring tasks with
+        the same order value that are marked concurrent and have their
+        dependencies complete (such as merge and mergereads, both following
+        trim) run at the same time.  See Task.concurrent."""
         LOGGER.info("ProjectData processing: %s", self.work_dir)
         if self.readonly:
             raise ProjectError("ProjectData is read-only")
         elif self.status != ProjectData.NONE:
             msg = "ProjectData status already defined as \"%s\"" % self.status
             raise ProjectError(msg)
-        self.status = ProjectData.PROCESSING
+        # Defer metadata writes for the duration, so that the file on disk is
+        # written once as each task starts (recording the one just finished
+        # along with it) and once more at the end, on success or failure.
+        self._save_deferred = True
         try:
-            self.path_proc.mkdir(parents=True, exist_ok=True)
-            tstat = self._metadata["task_status"]
-            while self.tasks_pending:
-                if self.task_current:
-                    raise ProjectError("a task is already running")
-                tstat["current"] = tstat["pending"].pop(0)
-                if not self.deps_completed(tstat["current"]):
-                    raise ProjectError("not all dependencies for task completed")
-                self.save_metadata()
-                self._run_task(tstat["current"])
-                tstat["completed"].append(tstat["current"])
-                tstat["current"] = ""
-                self.save_metadata()
-        except Exception as exception:
-            self.fail()
-            raise exception
-        self.status = ProjectData.COMPLETE
+            self.status = ProjectData.PROCESSING
+            try:
+                self.path_proc.mkdir(parents=True, exist_ok=True)
+                tstat = self._metadata["task_status"]
+                while self.tasks_pending:
+                    if self.task_current:
+                        raise ProjectError("a task is already running")
+                    group = self._next_task_group()
+                    tstat["current"] = group[0]
+                    self._save_metadata_now()
+                    self._run_task_group(group)
+                    tstat["current"] = ""
+                    self.save_metadata()
+            except Exception as exception:
+                self.fail()
+                raise exception
+            self.status = ProjectData.COMPLETE
+        finally:
+            self._save_deferred = False
+            self._flush_metadata()
 
     def fail(self):
         """Mark processing status as failed, and note exception, if any."""
@@ -353,98 +427,206 @@ class ProjectData:
             data = None
         else:
             self._metadata.update(data)
+            self._sample_paths_cache = None
         return data
 
     def save_metadata(self):
-        """Update project metadata on disk."""
+        """Update project metadata on disk.
+
+        During process() this just marks the metadata as changed, and the
+        actual write happens at the next task boundary."""
         if self.readonly:
             raise ProjectError("ProjectData is read-only")
-        mkparent(self.path)
-        with open(self.path, "w") as fout:
-            fout.write(yaml.dump(self._metadata))
+        if self._save_deferred:
+            self._dirty = True
+        else:
+            self._save_metadata_now()
 
     ###### Implementation Details
 
-    def _setup_exp_info(self, exp_info_full):
-        # Row by row, build up a dict for this project.  Even though we're
-        # reading the experiment info as a spreadsheet we'll treat most of this
-        # as though it's unordered sets for each project.  (Not actually using
-        # the set object as that gave me trouble with the YAML, but plain lists
-        # do fine.)
+    def _save_metadata_now(self):
+        """Write project metadata to disk, unless unchanged since last write."""
+        text = yaml.dump(self._metadata, Dumper=YAMLDumper)
+        if text != self._last_dump:
+            if not self._parent_dir_ensured:
+                mkparent(self.path)
+                self._parent_dir_ensured = True
+            # Write to a temporary file alongside and then move it into place,
+            # so anything reading the metadata never sees a partial file.
+            path = Path(self.path)
+            path_tmp = path.with_name(
+                "%s.%s.tmp" % (path.name, uuid.uuid4().hex))
+            # Created like a plain open() would, so the umask applies.
+            fdesc = os.open(
+                path_tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            try:
+                try:
+                    f_out = os.fdopen(fdesc, "wb")
+                except BaseException:
+                    os.close(fdesc)
+                    raise
+                with f_out:
+                    # Keep the permissions of any existing metadata file.
+                    try:
+                        os.fchmod(fdesc, path.stat().st_mode & 0o7777)
+                    except FileNotFoundError:
+                        pass
+                    f_out.write(text.encode("utf-8"))
+                os.replace(path_tmp, path)
+            except BaseException:
+                os.unlink(path_tmp)
+                raise
+            self._last_dump = text
+        self._dirty = False
+
+    def _flush_metadata(self):
+        """Write project metadata to disk if any changes are pending."""
+        if self._dirty:
+            self._save_metadata_now()
+
+    def _setup_exp_info(self, exp_info_rows):
+        # Row by row, build up a dict for this project from its rows of the
+        # experiment spreadsheet.  from_alignment only passes in this
+        # project's own rows, but any others are still skipped here, so the
+        # full spreadsheet can be given too.  Even though we're reading the
+        # experiment info as a spreadsheet we'll treat most of this as though
+        # it's unordered sets for each project.  (Not actually using the set
+        # object as that gave me trouble with the YAML, but plain lists do
+        # fine.)
         exp_info = {
             "sample_names": [],
             "tasks": [],
             "contacts": dict()
             }
-        for row in exp_info_full:
-            if row["Project"] == self.name:
-                sample_name = row["Sample_Name"].strip()
-                if not sample_name in exp_info["sample_names"]:
-                    exp_info["sample_names"].append(sample_name)
-                exp_info["contacts"].update(row["Contacts"])
-                for taskname in row["Tasks"]:
-                    if not taskname in exp_info["tasks"]:
-                        exp_info["tasks"].append(taskname)
+        # Sets of what's already been added to each list, for quick checks
+        names_seen = set()
+        tasks_seen = set()
+        for row in exp_info_rows:
+            if row["Project"] != self.name:
+                continue
+            sample_name = row["Sample_Name"].strip()
+            if not sample_name in names_seen:
+                names_seen.add(sample_name)
+                exp_info["sample_names"].append(sample_name)
+            exp_info["contacts"].update(row["Contacts"])
+            for taskname in row["Tasks"]:
+                if not taskname in tasks_seen:
+                    tasks_seen.add(taskname)
+                    exp_info["tasks"].append(taskname)
         return exp_info
 
     def _setup_tasks(self):
-        """Create the list of Task objects.
+        """Create the list of Task objects and the dependencies of each.
 
         This will take into account any defaults defined and dependencies of
-        each task."""
+        each task.  Since the result only depends on which task classes are
+        involved, the plan of what to run is worked out once per distinct set
+        of task classes and reused after that."""
         # dictionary of name/class pairs
         tasks_all = task.task_classes()
-        # explicitly-requested tasks
-        tasknames = self.experiment_info["tasks"][:]
-        # handle no-task case and add any defaults
-        if not tasknames:
-            tasknames = self.conf["task_null"][:]
-        tasknames += self.conf["task_defaults"]
-        # Add in dependencies for any that exist.
-        deps = set()
-        for taskname in tasknames:
-            deps.update(self.__deps_for(taskname))
-        tasknames += deps
-        # Keep unique only.
-        tasknames = list(set(tasknames))
-        # Instantiate each one by name.  Each object gets a dedicated config
+        # explicitly-requested tasks, handling the no-task case, plus any
+        # defaults
+        tasknames = set(self.experiment_info["tasks"] or self.conf["task_null"])
+        tasknames.update(self.conf["task_defaults"])
+        # Add in dependencies, direct and indirect.  The plan is keyed on
+        # all of these classes, so if a custom task replaces any of them
+        # (dependencies included) a new plan is worked out.
+        tasknames |= _deps_for(tasks_all, tasknames)
+        key = frozenset(tasks_all[taskname] for taskname in tasknames)
+        plan = ProjectData._TASK_PLANS.get(key)
+        if plan is None:
+            # Sort by the order attribute of each task (and by name, so that
+            # ties come out the same way every time).
+            classes = sorted(
+                (tasks_all[taskname] for taskname in tasknames),
+                key=lambda cls: (cls.order, cls.name))
+            deps = {
+                cls.name: frozenset(_deps_for(tasks_all, [cls.name]))
+                for cls in classes}
+            plan = (tuple(classes), deps)
+            ProjectData._TASK_PLANS[key] = plan
+        classes, deps = plan
+        # Instantiate each one.  Each object gets a dedicated config
         # dictionary and a reference to this ProjectData object.
         tasks = []
-        for taskname in tasknames:
-            cls = tasks_all[taskname]
-            task_config = self.conf["tasks"].get(taskname, {})
-            obj = cls(task_config, self)
-            tasks.append(obj)
-        # Sort by the order attribute of each task.
-        tasks = sorted(tasks)
-        return tasks
-
-    def __deps_for(self, taskname, total=None):
-        """Get all dependent tasks' names (including indirect) for one task."""
-        # Set of all dependencies seen so far.
-        tasks_all = task.task_classes()
-        if not total:
-            total = set()
-        for dep in tasks_all[taskname].dependencies:
-            if dep not in total:
-                total.update(self.__deps_for(dep, total))
-            total.add(dep)
-        return total
+        for cls in classes:
+            task_config = self.conf["tasks"].get(cls.name, {})
+            tasks.append(cls(task_config, self))
+        return tasks, deps
 
     def _setup_task_status(self):
+        # These stay as plain lists (rather than a deque and a set) since they
+        # go straight into the YAML metadata as-is.  With only a handful of
+        # tasks per project the list operations are trivial, and
+        # deps_completed already does its check as a set operation.
         task_status = {}
         task_status["pending"] = [task.name for task in self.tasks]
         task_status["completed"] = []
         task_status["current"] = ""
         return task_status
 
+    def _next_task_group(self):
+        """Take the next task(s) that can run at once off the pending list.
+
+        This is the next pending task plus, if it's marked concurrent, any
+        concurrent tasks directly following it that share its order value and
+        have their dependencies completed."""
+        pending = self._metadata["task_status"]["pending"]
+        group = [pending.pop(0)]
+        if not self.deps_completed(group[0]):
+            raise ProjectError("not all dependencies for task completed")
+        first = self._tasks_by_name[group[0]]
+        if not first.concurrent:
+            return group
+        while pending:
+            taskobj = self._tasks_by_name[pending[0]]
+            if not taskobj.concurrent or taskobj.order != first.order:
+                break
+            if not self.deps_completed(pending[0]):
+                break
+            group.append(pending.pop(0))
+        return group
+
+    def _run_task_group(self, group):
+        """Run one or more tasks at once, marking each completed.
+
+        The project's threads are split between the tasks.  If any task
+        fails, the current task is set to the (first) failed one and its
+        exception is re-raised once all of them have finished."""
+        tstat = self._metadata["task_status"]
+        if len(group) == 1:
+            self._run_task(group[0])
+            tstat["completed"].append(group[0])
+            return
+        taskobjs = [self._tasks_by_name[taskname] for taskname in group]
+        for taskobj in taskobjs:
+            taskobj.nthreads = max(1, self.nthreads // len(group))
+        try:
+            with ThreadPoolExecutor(max_workers=len(group)) as executor:
+                futures = [
+                    executor.submit(self._run_task, taskname)
+                    for taskname in group]
+        finally:
+            for taskobj in taskobjs:
+                taskobj.nthreads = None
+        failed = None
+        for taskname, future in zip(group, futures):
+            exception = future.exception()
+            if exception is None:
+                tstat["completed"].append(taskname)
+            elif failed is None:
+                failed = (taskname, exception)
+        if failed:
+            tstat["current"] = failed[0]
+            raise failed[1]
+
     def _run_task(self, taskname):
         """Process the next pending task."""
 
         msg = "ProjectData processing: %s, task: %s" % (self.work_dir, taskname)
         LOGGER.debug(msg)
         # match name to object
-        taskobj = next(task for task in self.tasks if task.name == taskname)
+        taskobj = self._tasks_by_name.get(taskname)
         if not taskobj:
             # This should never happen (so it probably will).
             raise ProjectError("task \"%s\" not recognized" % taskname)
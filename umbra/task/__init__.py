@@ -15,8 +15,10 @@ import sys
 import logging
 import inspect
 import subprocess
+import threading
 import traceback
 import copy
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
 from pathlib import Path
 from .. import config, CONFIG
 from ..util import mkparent
@@ -27,6 +29,9 @@ from ..util import mkparent
 
 LOGGER = logging.getLogger(__name__)
 
+# Illumina-style read file names, for Task.read_file_product
+_READ_FILE = re.compile("(.*_L[0-9]+_)R([12])(_001)\\.fastq\\.gz")
+
 def task_classes():
     """A dict of available Task classes in this module, by name.
 
@@ -185,9 +190,18 @@ class Task(metaclass=__TaskParent):
     # Task execution order.
     # A higher number means run later than tasks with lower numbers.  This
     # default setting will run after the core processing tasks but before the
-    # final package/upload/email set of tasks.
+    # final package/upload/email set of tasks.  Tasks run one at a time in
+    # this order, except as allowed by the concurrent setting below.
     order = 100
 
+    # Can this task run at the same time as others?
+    # If True, this task may run alongside the pending tasks immediately next
+    # to it that have the same order value, also set this, and have their
+    # dependencies completed.  The project's nthreads is split between the
+    # tasks running together.  Only set this for a task that doesn't depend on
+    # the files or state of any other task it might run with.
+    concurrent = False
+
     # List of task names to implicitly requre.
     # Tasks in the returned list will be automatically included in the set of
     # tasks executed.  (Note that run order is determined by each task's order
@@ -221,7 +235,10 @@ class Task(metaclass=__TaskParent):
         # Layer on the given config, if any.
         config.update_tree(self.config, conf or {})
         self.proj = proj
+        self._nthreads = None
         self.logf = None
+        # For writes to the log from multiple threads; see logwrite.
+        self.loglock = threading.Lock()
 
     def __del__(self):
         if self.logf:
@@ -249,11 +266,19 @@ class Task(metaclass=__TaskParent):
     def nthreads(self):
         """Max number of threads to be used in processing.
 
-        This is just an integer hint for any subprocesses started here.  The
-        task itself will always run within a single thread.
+        This is just an integer hint for any subprocesses started here.  A
+        task may also use it to run that many subprocesses at once.  It's the
+        project's nthreads unless set otherwise, as when concurrent tasks share
+        the project's threads.
         """
+        if self._nthreads is not None:
+            return self._nthreads
         return self.proj.nthreads
 
+    @nthreads.setter
+    def nthreads(self, value):
+        self._nthreads = value
+
     def run(self):
         """The core functionality for the task.
 
@@ -287,14 +312,26 @@ class Task(metaclass=__TaskParent):
             self.logf.close()
             raise exception
 
-    def runcmd(self, args, stdout=None, stderr=None):
+    def runcmd(self, args, stdout=None, stderr=None, buffered=False):
         """A simple wrapper to execute a command.
 
         This will call the command specified by the list of arguments, with the
         standard output and standard error streams defaulting to the task's
         open log file.  Any non-zero exit code will result in a
         subprocess.CalledProcessError being raised.  See also: subprocess.run.
+
+        If buffered is True, the command's output is collected and written to
+        the log in one piece once it finishes, so that commands run from
+        separate threads don't interleave their output in the log.
         """
+        if buffered:
+            LOGGER.debug("runcmd: %s", str(args))
+            proc = subprocess.run(
+                args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                check=False)
+            self.logwrite(proc.stdout.decode(errors="replace"))
+            proc.check_returncode()
+            return
         if not stdout:
             self.log_setup()
             stdout = self.logf
@@ -304,6 +341,38 @@ class Task(metaclass=__TaskParent):
         LOGGER.debug("runcmd: %s", str(args))
         subprocess.run(args, stdout=stdout, stderr=stderr, check=True)
 
+    def logwrite(self, text):
+        """Write text to the task's log file, safely from any thread."""
+        with self.loglock:
+            self.log_setup()
+            self.logf.write(text)
+            self.logf.flush()
+
+    def map_samples(self, func, nworkers=None, sample_paths=None):
+        """Call func(sample_name, paths) for every sample, several at once.
+
+        Samples are handled in separate threads, up to nworkers at a time (the
+        project's nthreads by default).  sample_paths can give a subset of
+        the samples to handle (all of them by default).  The first exception
+        raised for any sample is re-raised here, once samples already started
+        have finished; samples not yet started are skipped.  Use
+        runcmd(..., buffered=True) and logwrite for any logging from func so
+        output from different samples doesn't get mixed together.
+        """
+        nworkers = nworkers or self.nthreads
+        if sample_paths is None:
+            sample_paths = self.sample_paths
+        with ThreadPoolExecutor(max_workers=nworkers) as executor:
+            futures = [
+                executor.submit(func, samp, paths)
+                for samp, paths in sample_paths.items()]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in futures:
+                if future in done and future.exception():
+                    for pending in futures:
+                        pending.cancel()
+                    raise future.exception()
+
     @staticmethod
     def read_file_product(readfile, suffix="", merged=True):
         """Give a readfile-related filename, following the originals' name.
@@ -316,13 +385,12 @@ class Task(metaclass=__TaskParent):
         or:
         somesample_S1_L001_R_001.merged.fastq
         """
-        pat = "(.*_L[0-9]+_)R([12])(_001)\\.fastq\\.gz"
         # work with plain strings as well as paths
         readfile = Path(readfile)
         if merged:
-            name = re.sub(pat, "\\1R\\3" + suffix, readfile.name)
+            name = _READ_FILE.sub("\\1R\\3" + suffix, readfile.name)
         else:
-            name = re.sub(pat, "\\1R\\2\\3" + suffix, readfile.name)
+            name = _READ_FILE.sub("\\1R\\2\\3" + suffix, readfile.name)
         return name
 
     def task_dir_parent(self, taskname):
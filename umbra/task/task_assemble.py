@@ -4,6 +4,11 @@ import re
 from Bio import SeqIO
 from umbra import task
 
+# Contig IDs as written by SPAdes, with the contig number captured
+_SPADES_NODE = re.compile("^NODE_([0-9]+)_.*")
+# Contig FASTQ filenames, with the sample prefix captured
+_CONTIGS_FASTQ = re.compile("(.*)\\.contigs\\.fastq$")
+
 
 class TaskAssemble(task.Task):
     """Assemble contigs from all samples.
@@ -17,31 +22,34 @@ class TaskAssemble(task.Task):
     dependencies = ["spades", "merge"]
 
     def run(self):
-        for samp in self.sample_paths.keys():
-            # Set up paths to use
-            paths = self.sample_paths[samp]
-            fq_merged = (
-                self.task_dir_parent("merge") /
-                "PairedReads" /
-                self.read_file_product(paths[0], ".merged.fastq"))
-            fa_contigs = (
-                self.task_dir_parent("spades") /
-                "assembled" /
-                self.read_file_product(paths[0]) /
-                "contigs.fasta")
-            fq_contigs = (
-                self.task_dir_parent(self.name) /
-                "ContigsGeneious" /
-                self.read_file_product(paths[0], ".contigs.fastq"))
-            fq_combo = (
-                self.task_dir_parent(self.name) /
-                "CombinedGeneious" /
-                self.read_file_product(paths[0], ".contigs_reads.fastq"))
-            # Post-process the assembled contigs: create FASTQ version for all
-            # contigs above a given length, using altered sequence
-            # descriptions, and then combine with the original reads.
-            self.prep_contigs_for_geneious(fa_contigs, fq_contigs)
-            combine_contigs_for_geneious(fq_contigs, fq_merged, fq_combo)
+        self.map_samples(self._assemble_sample)
+
+    def _assemble_sample(self, samp, paths):
+        """Post-process the assembled contigs for one sample."""
+        # pylint: disable=unused-argument
+        # Set up paths to use
+        fq_merged = (
+            self.task_dir_parent("merge") /
+            "PairedReads" /
+            self.read_file_product(paths[0], ".merged.fastq"))
+        fa_contigs = (
+            self.task_dir_parent("spades") /
+            "assembled" /
+            self.read_file_product(paths[0]) /
+            "contigs.fasta")
+        fq_contigs = (
+            self.task_dir_parent(self.name) /
+            "ContigsGeneious" /
+            self.read_file_product(paths[0], ".contigs.fastq"))
+        fq_combo = (
+            self.task_dir_parent(self.name) /
+            "CombinedGeneious" /
+            self.read_file_product(paths[0], ".contigs_reads.fastq"))
+        # Post-process the assembled contigs: create FASTQ version for all
+        # contigs above a given length, using altered sequence
+        # descriptions, and then combine with the original reads.
+        self.prep_contigs_for_geneious(fa_contigs, fq_contigs)
+        combine_contigs_for_geneious(fq_contigs, fq_merged, fq_combo)
 
     def prep_contigs_for_geneious(self, fa_in, fq_out):
         """Filter and format contigs for use in Geneious.
@@ -50,14 +58,14 @@ class TaskAssemble(task.Task):
         can get a FASTQ file to combine with the reads in the next step.
         Modify the sequence ID line to be: <sample>-contig_<contig_number>
         """
-        match = re.match("(.*)\\.contigs\\.fastq$", fq_out.name)
+        match = _CONTIGS_FASTQ.match(fq_out.name)
         sample_prefix = match.group(1)
         task.mkparent(fq_out)
         with open(fq_out, "w") as f_out, open(fa_in, "r") as f_in:
             for rec in SeqIO.parse(f_in, "fasta"):
                 if len(rec.seq) > self.config["contig_length_min"]:
                     rec.letter_annotations["phred_quality"] = [40]*len(rec.seq)
-                    match = re.match("^NODE_([0-9]+)_.*", rec.id)
+                    match = _SPADES_NODE.match(rec.id)
                     contig_num = match.group(1)
                     rec.id = "%s-contig_%s" % (sample_prefix, contig_num)
                     rec.description = ""
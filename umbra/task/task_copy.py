@@ -1,10 +1,28 @@
 """Copy the run directory into the processing directory."""
 
-from distutils.dir_util import copy_tree
+import os
+import shutil
 from umbra import task
 
+def _link_or_copy(src, dst):
+    """Hard-link a file into place, falling back to a regular copy.
+
+    Linking fails across filesystems (among other cases), so in that case
+    we copy the file contents instead.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
 class TaskCopy(task.Task):
-    """Copy the run directory into the processing directory."""
+    """Copy the run directory into the processing directory.
+
+    Files are hard-linked rather than copied wherever possible, since the run
+    directory is treated as a read-only archive.  This means the "copies"
+    share their contents with the originals, so nothing should modify the
+    run directory's files (or these copies) in place after the fact.
+    """
 
     # pylint: disable=no-member
     order = 2
@@ -13,4 +31,5 @@ class TaskCopy(task.Task):
         src = str(self.proj.alignment.run.path)
         dest = str(self.task_dir_parent(self.name) /
                    self.proj.alignment.run.run_id)
-        copy_tree(src, dest)
+        shutil.copytree(
+            src, dest, copy_function=_link_or_copy, dirs_exist_ok=True)
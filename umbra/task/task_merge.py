@@ -1,7 +1,7 @@
 """Interleave forward and reverse reads for each sample."""
 
+from itertools import islice
 from pathlib import Path
-from Bio import SeqIO
 from umbra import task
 from umbra.util import ProjectError
 
@@ -10,24 +10,29 @@ class TaskMerge(task.Task):
 
     # pylint: disable=no-member
     order = 11
+    concurrent = True
     dependencies = ["trim"]
 
     def run(self):
-        for samp in self.sample_paths:
-            paths = self.sample_paths[samp]
+        for paths in self.sample_paths.values():
             if len(paths) != 2:
                 raise ProjectError("merging needs 2 files per sample")
-            fqs_in = [self._get_tp(p) for p in paths]
-            fq_out = (
-                self.task_dir_parent(self.name) /
-                "PairedReads" /
-                self.read_file_product(paths[0], ".merged.fastq"))
-            interleave_pair(fq_out, fqs_in)
-            # Merge each file pair. If the expected output file is missing,
-            # raise an exception.
-            if not Path(fq_out).exists():
-                msg = "missing output file %s" % fq_out
-                raise ProjectError(msg)
+        self.map_samples(self._merge_sample)
+
+    def _merge_sample(self, samp, paths):
+        """Interleave the trimmed file pair for one sample."""
+        # pylint: disable=unused-argument
+        fqs_in = [self._get_tp(p) for p in paths]
+        fq_out = (
+            self.task_dir_parent(self.name) /
+            "PairedReads" /
+            self.read_file_product(paths[0], ".merged.fastq"))
+        interleave_pair(fq_out, fqs_in)
+        # Merge each file pair. If the expected output file is missing,
+        # raise an exception.
+        if not Path(fq_out).exists():
+            msg = "missing output file %s" % fq_out
+            raise ProjectError(msg)
 
     def _get_tp(self, path):
         return (
@@ -36,13 +41,39 @@ class TaskMerge(task.Task):
             self.read_file_product(path, ".trimmed.fastq", merged=False))
 
 def interleave_pair(fq_out, fqs_in):
-    """Interleave reads from the pair of input FASTQs to a single output FASTQ."""
+    """Interleave reads from the pair of input FASTQs to a single output FASTQ.
+
+    This copies each four-line FASTQ record as-is rather than parsing it, so
+    it assumes unwrapped sequence and quality lines (as cutadapt writes).
+    """
     task.mkparent(fq_out)
-    with open(fq_out, "w") as f_out, \
-            open(fqs_in[0], "r") as f_r1, \
-            open(fqs_in[1], "r") as f_r2:
-        riter1 = SeqIO.parse(f_r1, "fastq")
-        riter2 = SeqIO.parse(f_r2, "fastq")
-        for rec1, rec2 in zip(riter1, riter2):
-            SeqIO.write(rec1, f_out, "fastq")
-            SeqIO.write(rec2, f_out, "fastq")
+    with open(fq_out, "wb") as f_out, \
+            open(fqs_in[0], "rb") as f_r1, \
+            open(fqs_in[1], "rb") as f_r2:
+        while True:
+            rec1 = _read_record(f_r1)
+            rec2 = _read_record(f_r2)
+            if not rec1 and not rec2:
+                break
+            if not rec1 or not rec2:
+                raise ProjectError(
+                    "different numbers of reads in %s and %s" % tuple(fqs_in))
+            f_out.write(rec1)
+            f_out.write(rec2)
+
+def _read_record(f_in):
+    """Read one four-line FASTQ record as bytes, or b"" at the end of the file.
+
+    Raises ProjectError if the record is truncated or malformed.
+    """
+    lines = list(islice(f_in, 4))
+    if not lines:
+        return b""
+    if len(lines) != 4 or \
+            not lines[0].startswith(b"@") or \
+            not lines[2].startswith(b"+") or \
+            len(lines[1].rstrip(b"\r\n")) != len(lines[3].rstrip(b"\r\n")):
+        raise ProjectError("malformed FASTQ record in %s" % f_in.name)
+    if not lines[3].endswith(b"\n"):
+        lines[3] += b"\n"
+    return b"".join(lines)
@@ -9,27 +9,32 @@ class TaskMergeReads(task.Task):
 
     # pylint: disable=no-member
     order = 11
+    concurrent = True
     dependencies = ["trim"]
 
     def run(self):
-        for samp in self.sample_paths:
-            paths = self.sample_paths[samp]
+        for paths in self.sample_paths.values():
             if len(paths) != 2:
                 raise ProjectError("merging needs 2 files per sample")
-            fqs_in = [self._get_tp(p) for p in paths]
-            # pear takes an output name prefix for its four output files, not a
-            # single filename
-            prefix_out = str(
-                self.task_dir_parent(self.name) /
-                "MergedReads" /
-                self.read_file_product(paths[0]))
-            self.pear(prefix_out, fqs_in)
-            # Merge each file pair. If the expected main output file is
-            # missing, raise an exception.
-            asm_out = prefix_out + ".assembled.fastq"
-            if not Path(asm_out).exists():
-                msg = "missing output file %s" % asm_out
-                raise ProjectError(msg)
+        self.map_samples(self._merge_sample)
+
+    def _merge_sample(self, samp, paths):
+        """Merge the trimmed file pair for one sample with pear."""
+        # pylint: disable=unused-argument
+        fqs_in = [self._get_tp(p) for p in paths]
+        # pear takes an output name prefix for its four output files, not a
+        # single filename
+        prefix_out = str(
+            self.task_dir_parent(self.name) /
+            "MergedReads" /
+            self.read_file_product(paths[0]))
+        self.pear(prefix_out, fqs_in)
+        # Merge each file pair. If the expected main output file is
+        # missing, raise an exception.
+        asm_out = prefix_out + ".assembled.fastq"
+        if not Path(asm_out).exists():
+            msg = "missing output file %s" % asm_out
+            raise ProjectError(msg)
 
     def _get_tp(self, path):
         return (
@@ -40,4 +45,4 @@ class TaskMergeReads(task.Task):
     def pear(self, prefix_out, fqs_in):
         task.mkparent(prefix_out)
         args = ["pear", "-f", fqs_in[0], "-r", fqs_in[1], "-o", prefix_out]
-        self.runcmd(args)
+        self.runcmd(args, buffered=True)
@@ -1,10 +1,14 @@
 """Create zipfile of processing directory and metadata."""
 
-from pathlib import Path
 import zipfile
 import os
 from umbra import task
 from umbra.util import mkparent
+
+# Files with these extensions are already compressed, so they're stored as-is
+# rather than spending time deflating them again for no gain.
+_STORED_EXTS = {".gz", ".bam", ".zip", ".bz2", ".xz", ".jpg", ".png"}
+
 class TaskPackage(task.Task):
     """Create zipfile of processing directory and metadata."""
 
@@ -15,13 +19,23 @@ class TaskPackage(task.Task):
         # TODO reorganize path_pack
         mkparent(self.proj.path_pack)
         # By default ZipFile will not actually compress!  We need to specify a
-        # compression method explicitly for that.
-        with zipfile.ZipFile(self.proj.path_pack, "x", zipfile.ZIP_DEFLATED) as zipper:
-            # Archive everything in the processing directory
+        # compression method explicitly for that.  The fastest level gets
+        # nearly all of the benefit for the text files we deflate.
+        with zipfile.ZipFile(
+                self.proj.path_pack, "x", zipfile.ZIP_DEFLATED,
+                compresslevel=1) as zipper:
+            # Archive everything in the processing directory, but trim the
+            # name so it's relative to the processing directory's parent.
+            parent = str(self.proj.path_proc.parent)
             for root, dummy, files in os.walk(self.proj.path_proc):
+                arcroot = os.path.relpath(root, parent)
                 for fname in files:
-                    # Archive the file but trim the name so it's relative to
-                    # the processing directory.
-                    filename = os.path.join(root, fname)
-                    arcname = Path(filename).relative_to(self.proj.path_proc.parent)
-                    zipper.write(filename, arcname)
+                    ext = os.path.splitext(fname)[1].lower()
+                    if ext in _STORED_EXTS:
+                        compress_type = zipfile.ZIP_STORED
+                    else:
+                        compress_type = zipfile.ZIP_DEFLATED
+                    zipper.write(
+                        os.path.join(root, fname),
+                        os.path.join(arcroot, fname),
+                        compress_type)
@@ -1,6 +1,7 @@
 """Assemble contigs from all samples using SPAdes."""
 
-from pathlib import Path
+import os
+import functools
 from subprocess import CalledProcessError
 from umbra import task
 from umbra.util import touch
@@ -16,45 +17,77 @@ class TaskSpades(task.Task):
     dependencies = ["merge"]
 
     def run(self):
-        for samp in self.sample_paths.keys():
-            paths = self.sample_paths[samp]
-            fq_merged = (
-                self.task_dir_parent("merge") /
-                "PairedReads" /
-                self.read_file_product(paths[0], ".merged.fastq"))
-            spades_dir = (
-                self.task_dir_parent(self.name) /
-                "assembled" /
-                self.read_file_product(paths[0]))
-            self.assemble_reads(fq_merged, spades_dir)
-
-    def assemble_reads(self, fq_in, dir_out):
+        # Samples with empty input (which spades always fails on) get their
+        # placeholder contigs right away.  The rest are assembled in
+        # parallel, with the project's threads split between the
+        # simultaneous spades processes.
+        to_assemble = {}
+        for samp, paths in self.sample_paths.items():
+            fq_merged, spades_dir = self._sample_paths_io(paths)
+            if os.stat(fq_merged).st_size == 0:
+                self._skip_assembly(fq_merged, spades_dir)
+            else:
+                to_assemble[samp] = paths
+        nworkers = max(1, min(self.nthreads, len(to_assemble)))
+        nthreads = max(1, self.nthreads // nworkers)
+        self.map_samples(
+            functools.partial(self._assemble_sample, nthreads=nthreads),
+            nworkers,
+            to_assemble)
+
+    def _sample_paths_io(self, paths):
+        """Give the merged reads file and spades directory for one sample."""
+        fq_merged = (
+            self.task_dir_parent("merge") /
+            "PairedReads" /
+            self.read_file_product(paths[0], ".merged.fastq"))
+        spades_dir = (
+            self.task_dir_parent(self.name) /
+            "assembled" /
+            self.read_file_product(paths[0]))
+        return fq_merged, spades_dir
+
+    def _assemble_sample(self, samp, paths, nthreads=None):
+        """Assemble the merged reads for one sample."""
+        # pylint: disable=unused-argument
+        fq_merged, spades_dir = self._sample_paths_io(paths)
+        self.assemble_reads(fq_merged, spades_dir, nthreads)
+
+    def _skip_assembly(self, fq_in, dir_out):
+        """Create a placeholder contigs file for an empty input file."""
+        fp_out = dir_out / "contigs.fasta"
+        self.logwrite(
+            "Skipping assembly for empty file: %s\n"
+            "creating placeholder contig file.\n" % str(fq_in))
+        touch(fp_out)
+        return fp_out
+
+    def assemble_reads(self, fq_in, dir_out, nthreads=None):
         """Assemble a pair of read files with SPAdes.
 
         This runs spades.py on a single sample, saving the output to a given
         directory.  The contigs, if built, will be in contigs.fasta.  Spades
         seems to crash a lot so if anything goes wrong we just create an empty
-        contigs.fasta in the directory and log the error."""
+        contigs.fasta in the directory and log the error.  spades is given
+        nthreads threads (by default the project's nthreads)."""
         fp_out = dir_out / "contigs.fasta"
         # Spades always fails for empty input, so we'll explicitly skip that
         # case.  It might crash anyway, so we handle that below too.
-        if Path(fq_in).stat().st_size == 0:
-            self.logf.write("Skipping assembly for empty file: %s\n" % str(fq_in))
-            self.logf.write("creating placeholder contig file.\n")
-            touch(fp_out)
-            return fp_out
+        if os.stat(fq_in).st_size == 0:
+            return self._skip_assembly(fq_in, dir_out)
         args = ["spades.py", "--12", fq_in,
                 "-o", dir_out,
-                "-t", self.nthreads,
+                "-t", nthreads or self.nthreads,
                 "--phred-offset", self.config["phred_offset"]]
         args = [str(x) for x in args]
         # spades tends to throw nonzero exit codes with short files, empty
         # files, etc.   If something goes wrong during assembly we'll just make
         # a stub file and move on.
         try:
-            self.runcmd(args)
+            self.runcmd(args, buffered=True)
         except CalledProcessError:
-            self.logf.write("spades exited with errors.\n")
-            self.logf.write("creating placeholder contig file.\n")
+            self.logwrite(
+                "spades exited with errors.\n"
+                "creating placeholder contig file.\n")
             touch(fp_out)
         return fp_out
@@ -1,6 +1,6 @@
 """Trim adapters from raw fastq.gz files."""
 
-from pathlib import Path
+import functools
 from umbra.illumina.util import ADAPTERS
 from umbra.util import ProjectError
 from umbra import task
@@ -12,27 +12,34 @@ class TaskTrim(task.Task):
     order = 10
 
     def run(self):
-        # For each sample, separately process the one or more associated files.
-        for samp in self.sample_paths.keys():
-            paths = self.sample_paths[samp]
+        for paths in self.sample_paths.values():
             if len(paths) > 2:
                 raise ProjectError("trimming can't handle >2 files per sample")
-            for i, path in enumerate(paths):
-                adapter = ADAPTERS["Nextera"][i]
-                fastq_in = str(path)
-                fastq_out = (
-                    self.task_dir_parent(self.name) /
-                    "trimmed" /
-                    self.read_file_product(
-                        path,
-                        ".trimmed.fastq",
-                        merged=False))
-                task.mkparent(fastq_out)
-                args = ["cutadapt", "-a", adapter, "-o", fastq_out, fastq_in]
-                # Call cutadapt with each file.  If the exit status is
-                # nonzero or if the expected output file is missing, this will
-                # raise an exception.
-                self.runcmd(args)
-                if not Path(fastq_out).exists():
-                    msg = "missing output file %s" % fastq_out
-                    raise ProjectError(msg)
+        # Samples are trimmed in parallel up to the project's thread count.
+        # If there are more threads than samples, the extra cores go to each
+        # cutadapt process (which also lets it decompress its input in
+        # parallel with pigz, if available).
+        nworkers = max(1, min(self.nthreads, len(self.sample_paths)))
+        ncores = max(1, self.nthreads // nworkers)
+        self.map_samples(
+            functools.partial(self._trim_sample, ncores=ncores), nworkers)
+
+    def _trim_sample(self, samp, paths, ncores=1):
+        """Run cutadapt separately on each file for one sample.
+
+        (cutadapt's paired-end mode would need only one call per sample but
+        insists that read names match between the files, which we don't
+        otherwise require.)  cutadapt's nonzero exit status on failure raises
+        an exception here via runcmd.
+        """
+        # pylint: disable=unused-argument
+        for path, adapter in zip(paths, ADAPTERS["Nextera"]):
+            fastq_out = (
+                self.task_dir_parent(self.name) /
+                "trimmed" /
+                self.read_file_product(path, ".trimmed.fastq", merged=False))
+            task.mkparent(fastq_out)
+            args = ["cutadapt", "-a", adapter, "-o", str(fastq_out), str(path)]
+            if ncores > 1:
+                args[1:1] = ["-j", str(ncores)]
+            self.runcmd(args, buffered=True)
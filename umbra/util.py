@@ -8,16 +8,22 @@ from pathlib import Path
 import re
 import os
 import time
-import warnings
 import yaml
+# Use the much faster libyaml-based loader and dumper when available
+try:
+    from yaml import CSafeLoader as YAMLLoader, CSafeDumper as YAMLDumper
+except ImportError:
+    from yaml import SafeLoader as YAMLLoader, SafeDumper as YAMLDumper
 
 class ProjectError(Exception):
     """Any sort of project-related exception."""
 
+# Anything not safe for a slugified name
+_SLUG_UNSAFE = re.compile("[^A-Za-z0-9-_]")
+
 def slugify(text, mask="_"):
     """Create a short, simple text string from the given input text."""
-    pat = "[^A-Za-z0-9-_]"
-    safe_text = re.sub(pat, mask, text)
+    safe_text = _SLUG_UNSAFE.sub(mask, text)
     return safe_text
 
 def datestamp(dateobj):
@@ -48,9 +54,7 @@ def mkparent(path):
 def yaml_load(path):
     """Load YAML from a file, assuming a dictionary if empty."""
     with open(path) as fin:
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=DeprecationWarning)
-            data = yaml.safe_load(fin)
+        data = yaml.load(fin, Loader=YAMLLoader)
     # If there's no actual yaml data in the file (like, say, just a bunch of
     # comments) we get None!  That makes it tricky later on so for our purposes
     # we'll catch that and default to a dict.